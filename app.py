@@ -1,22 +1,30 @@
-import numpy as np
 import streamlit as st
 from PIL import Image
 
 from streamlit_image_zoom import image_zoom
 
 
+@st.cache_resource
+def load_default_image():
+    # Decoded once per server process and shared by all sessions.
+    return Image.open("images/building.jpg").convert("RGB")
+
+
 def init_variables():
     if "img_ref" not in st.session_state:
-        st.session_state.img_ref = np.array(Image.open("images/building.jpg"))
+        st.session_state.img_ref = load_default_image()
     if "show_img" not in st.session_state:
         st.session_state.show_img = st.session_state.img_ref
     if "size_image" not in st.session_state:
         st.session_state.size_image = 1024
 
 
-def load_image(file):
-    # Function to read and convert to np.array.
-    image = np.array(Image.open(file).convert("RGB"))
+def load_image(file, size=768):
+    # Function to read and convert to RGB PIL image.
+    image = Image.open(file)
+    # JPEG only: decode at the smallest DCT scale (1/2, 1/4, 1/8) still larger than the displayed size.
+    image.draft("RGB", (size, size))
+    image = image.convert("RGB")
 
     return image
 
@@ -24,7 +32,7 @@ def load_image(file):
 def plot_images(img):
     st.session_state.show_img = img
 
-    if all(dim < 512 for dim in img.shape[:2]):
+    if all(dim < 512 for dim in img.size):
         st.session_state.size_image = 512
     else:
         st.session_state.size_image = 768
@@ -69,10 +77,11 @@ def main():
     )
     if mode != "mousemove":
         increase_factor = st.sidebar.slider(
-            "Select increase factor:", min_value=0.0, max_value=1.0, value=0.2, step=0.1
+            "Select increase factor:", min_value=0.1, max_value=1.0, value=0.2, step=0.1
         )
     else:
-        increase_factor = 0.0
+        # Not used on mousemove mode.
+        increase_factor = 0.2
     st.sidebar.divider()
 
     ####################################################################
@@ -1,13 +1,290 @@
 import base64
+import hashlib
 import io
-from typing import Optional, Tuple, Union
+import warnings
+import weakref
+from typing import Dict, Optional, Tuple, Union
 
 import numpy as np
+import streamlit as st
 import streamlit.components.v1 as components
-from PIL import Image
+from PIL import Image, features
+from streamlit import runtime
+
+try:
+    import cv2
+except ImportError:  # OpenCV is optional, Pillow is used for resizing otherwise.
+    cv2 = None
 
 __version__ = "0.0.3"
 
+# Content digests of the input images, keyed by object id and dropped when the image is garbage collected.
+_image_digests: Dict[int, str] = {}
+
+_CSS_CODE = """
+    <style>
+        #container {
+            position: relative;
+            overflow: hidden;
+            cursor: zoom-in;
+        }
+        #image {
+            position: absolute;
+            top: 0;
+            left: 0;
+            width: 100%;
+            height: 100%;
+            /* Own compositor layer, so zoom transforms do not repaint the page. */
+            will-change: transform;
+            transform: translateZ(0);
+            backface-visibility: hidden;
+        }
+    </style>
+"""
+
+_JS_CODE = """
+        function calculateTransformOrigin(offsetX, offsetY, image, boundingRect, keep_resolution) {
+            let originX, originY;
+            if (keep_resolution) {
+                const original_width = parseInt(image.getAttribute('data-original-width'));
+                const original_height = parseInt(image.getAttribute('data-original-height'));
+                const originX_original = (offsetX / boundingRect.width) * original_width;
+                const originY_original = (offsetY / boundingRect.height) * original_height;
+                originX = (originX_original / original_width) * 100 + '%';
+                originY = (originY_original / original_height) * 100 + '%';
+            } else {
+                originX = (offsetX / boundingRect.width) * 100 + '%';
+                originY = (offsetY / boundingRect.height) * 100 + '%';
+            }
+            return { originX, originY };
+        }
+
+        function cachedBoundingRect(image) {
+            // Read the bounding rect once per gesture instead of on every event, since it forces a layout.
+            // The container is used because its box, unlike the image one, does not change with the zoom.
+            const container = image.parentElement;
+            const bounds = { rect: container.getBoundingClientRect() };
+            function refresh() {
+                bounds.rect = container.getBoundingClientRect();
+            }
+            image.addEventListener('mouseenter', refresh, { passive: true });
+            window.addEventListener('resize', refresh, { passive: true });
+            window.addEventListener('scroll', refresh, { passive: true });
+            return bounds;
+        }
+"""
+
+# Only the function of the selected mode is shipped, "default" works with mousemove.
+_JS_FUNCS = {
+    "mousemove": """
+        function ImageZoomMouseMove(selector, scale_factor, keep_resolution) {
+            const image = document.getElementById(selector);
+            const bounds = cachedBoundingRect(image);
+            let clientX, clientY;
+            let frame = null;
+
+            // Coalesce mousemove events into a single transform update per frame.
+            function update() {
+                frame = null;
+                const boundingRect = bounds.rect;
+                const offsetX = (clientX - boundingRect.left);
+                const offsetY = (clientY - boundingRect.top);
+                const { originX, originY } = calculateTransformOrigin(offsetX, offsetY, image, boundingRect, keep_resolution);
+                if (keep_resolution) {
+                    image.src = image.getAttribute('data-original-src');
+                }
+                image.style.transformOrigin = `${originX} ${originY}`;
+                image.style.transform = `scale(${scale_factor})`;
+            }
+
+            image.addEventListener('mousemove', function(event) {
+                clientX = event.clientX;
+                clientY = event.clientY;
+                if (frame === null) {
+                    frame = requestAnimationFrame(update);
+                }
+            }, { passive: true });
+
+            image.addEventListener('mouseout', function(event) {
+                if (frame !== null) {
+                    cancelAnimationFrame(frame);
+                    frame = null;
+                }
+                if (keep_resolution) {
+                    image.src = image.getAttribute('src');
+                }
+                image.style.transformOrigin = 'center center';
+                image.style.transform = 'scale(1)';
+            }, { passive: true });
+        };
+""",
+    "scroll": """
+        function ImageZoomScroll(selector, scale_factor, increment, keep_resolution) {
+            const image = document.getElementById(selector);
+            const bounds = cachedBoundingRect(image);
+            let scale = 1
+            let clientX, clientY;
+            let frame = null;
+
+            // Coalesce wheel events into a single transform update per frame.
+            function update() {
+                frame = null;
+                const boundingRect = bounds.rect;
+                const offsetX = clientX - boundingRect.left;
+                const offsetY = clientY - boundingRect.top;
+                const { originX, originY } = calculateTransformOrigin(offsetX, offsetY, image, boundingRect, keep_resolution);
+                image.style.transformOrigin = `${originX} ${originY}`;
+                image.style.transform = `scale(${scale})`;
+            }
+
+            image.addEventListener('wheel', function(event) {
+                event.preventDefault();
+                // Get the delta of the scroll event
+                var delta = event.deltaY || -event.detail;
+                if (delta === undefined) {
+                    //we are on firefox
+                    delta = event.originalEvent.detail;
+                }
+                const sign = Math.sign(delta);
+                scale += sign > 0 ? -increment : increment;
+                scale = Math.max(1, Math.min(scale_factor, scale));
+
+                if (keep_resolution) {
+                    image.src = image.getAttribute('data-original-src');
+                }
+                clientX = event.clientX;
+                clientY = event.clientY;
+                if (frame === null) {
+                    frame = requestAnimationFrame(update);
+                }
+            });
+
+            image.addEventListener('mouseout', function(event) {
+                if (frame !== null) {
+                    cancelAnimationFrame(frame);
+                    frame = null;
+                }
+                if (keep_resolution) {
+                    image.src = image.getAttribute('src');
+                }
+                image.style.transformOrigin = 'center center';
+                image.style.transform = 'scale(1)';
+                scale = 1
+            }, { passive: true });
+        };
+""",
+    "both": """
+        function ImageZoomBoth(selector, scale_factor, increment, keep_resolution) {
+            const image = document.getElementById(selector);
+            const bounds = cachedBoundingRect(image);
+            let scale = 1;
+            let clientX, clientY;
+            let frame = null;
+
+            // Coalesce mousemove and wheel events into a single transform update per frame.
+            function update() {
+                frame = null;
+                const boundingRect = bounds.rect;
+                const offsetX = clientX - boundingRect.left;
+                const offsetY = clientY - boundingRect.top;
+                const { originX, originY } = calculateTransformOrigin(offsetX, offsetY, image, boundingRect, keep_resolution);
+                image.style.transformOrigin = `${originX} ${originY}`;
+                image.style.transform = `scale(${scale})`;
+            }
+
+            image.addEventListener('mousemove', function(event) {
+                clientX = event.clientX;
+                clientY = event.clientY;
+                if (frame === null) {
+                    frame = requestAnimationFrame(update);
+                }
+            }, { passive: true });
+
+            image.addEventListener('wheel', function(event) {
+                event.preventDefault();
+                // Get the delta of the scroll event
+                var delta = event.deltaY || -event.detail;
+                if (delta === undefined) {
+                    //we are on firefox
+                    delta = event.originalEvent.detail;
+                }
+                const sign = Math.sign(delta);
+                scale += sign > 0 ? -increment : increment;
+                scale = Math.max(1, Math.min(scale_factor, scale));
+
+                if (keep_resolution) {
+                    image.src = image.getAttribute('data-original-src');
+                }
+                clientX = event.clientX;
+                clientY = event.clientY;
+                if (frame === null) {
+                    frame = requestAnimationFrame(update);
+                }
+            });
+
+            image.addEventListener('mouseout', function(event) {
+                if (frame !== null) {
+                    cancelAnimationFrame(frame);
+                    frame = null;
+                }
+                if (keep_resolution) {
+                    image.src = image.getAttribute('src');
+                }
+                image.style.transformOrigin = 'center center';
+                image.style.transform = 'scale(1)';
+                scale = 1;
+            }, { passive: true });
+        };
+""",
+}
+
+_JS_CALLS = {
+    "mousemove": "ImageZoomMouseMove('image', {zoom_factor}, {keep_resolution});",
+    "scroll": "ImageZoomScroll('image', {zoom_factor}, {increment}, {keep_resolution});",
+    "both": "ImageZoomBoth('image', {zoom_factor}, {increment}, {keep_resolution});",
+}
+
+_HTML_TEMPLATE = """
+    {css}
+    <div id="container" style="width: {width}px; height: {height}px;">
+        <img id="image" src="{src}" {params_keep_res}>
+    </div>
+    <script>
+    {js}
+    {js_call}
+    </script>
+"""
+
+
+def check_jpeg_backend() -> bool:
+    """
+    Check whether Pillow was built against libjpeg-turbo.
+
+    The image is encoded as JPEG whenever the image or its size changes, and libjpeg-turbo's SIMD code paths
+    make it several times faster than the reference libjpeg. The official Pillow wheels already ship with libjpeg-turbo,
+    so this only fails for custom builds.
+
+    Returns:
+        bool: True if libjpeg-turbo is available, False otherwise.
+
+    """
+    try:
+        available = bool(features.check_feature("libjpeg_turbo"))
+    except ValueError:
+        # Old Pillow versions do not report the JPEG backend.
+        available = False
+
+    if not available:
+        warnings.warn(
+            "Pillow is not built against libjpeg-turbo. Image encoding will be slower. "
+            "Install the official Pillow wheels or build Pillow against libjpeg-turbo.",
+            RuntimeWarning,
+        )
+    return available
+
+
+check_jpeg_backend()
+
 
 def check_image(image: Union[Image.Image, np.ndarray]) -> Image.Image:
     """
@@ -25,38 +302,148 @@ def check_image(image: Union[Image.Image, np.ndarray]) -> Image.Image:
     """
     Image.MAX_IMAGE_PIXELS = None
 
-    if isinstance(image, Image.Image):
+    # Skip the conversion (a full copy of the image) when the image is already RGB.
+    if isinstance(image, Image.Image) and image.mode == "RGB":
+        # Decode lazily opened files (e.g. Image.open) once, in place.
+        image.load()
+        image_pil = image
+
+    elif isinstance(image, Image.Image):
         image_pil = image.convert("RGB")
 
     elif isinstance(image, np.ndarray):
-        image_pil = Image.fromarray(image).convert("RGB")
+        image_pil = Image.fromarray(image)
+        if not (image.dtype == np.uint8 and image.ndim == 3 and image.shape[2] == 3):
+            image_pil = image_pil.convert("RGB")
     else:
         raise TypeError("Only supported format are Pillow Image and Numpy Array.")
 
     return image_pil
 
 
-def pillow_to_base64(image: Image.Image) -> str:
+def resize_image(image: Image.Image, new_size: Tuple[int, int]) -> Image.Image:
+    """
+    Resize a PIL Image.
+
+    Large downscales (2x or more) use Pillow with reducing_gap, which first reduces the image with a fast box filter.
+    Upscales and smaller downscales, where reducing_gap has no effect, use OpenCV when it is installed, since its
+    SIMD uint8 kernels outweigh the cost of converting the image to a NumPy array and back.
+
+    Args:
+        image (Image.Image): The PIL Image to be resized.
+        new_size (Tuple[int, int]): The new size of the image (width, height).
+
+    Returns:
+        Image.Image: The resized image.
+
+    Raises:
+        AssertionError: If the image is not an 8-bit RGB image.
+
+    """
+    # Keep the whole resize in uint8, other modes would go through slower (e.g. float) code paths.
+    assert image.mode == "RGB", "Only 8-bit RGB images can be resized."
+    if image.size == new_size:
+        return image
+
+    width, height = image.size
+    large_downscale = width >= 2 * new_size[0] and height >= 2 * new_size[1]
+    if cv2 is None or large_downscale:
+        return image.resize(new_size, reducing_gap=2.0)
+
+    if new_size[0] * new_size[1] < width * height:
+        interpolation = cv2.INTER_AREA
+    else:
+        interpolation = cv2.INTER_LINEAR
+    return Image.fromarray(cv2.resize(np.asarray(image), new_size, interpolation=interpolation))
+
+
+def pillow_to_bytes(image: Image.Image, quality: int = 85, subsampling: int = 2) -> bytes:
     """
-    Convert a PIL Image to a base64-encoded string.
+    Encode a PIL Image as JPEG.
 
     Args:
         image (Image.Image): The PIL Image to be converted.
+        quality (int): The JPEG quality, from 0 to 100. Default is 85.
+        subsampling (int): The JPEG chroma subsampling. 0 for 4:4:4, 1 for 4:2:2 and 2 for 4:2:0. Default is 2.
 
     Returns:
-        str: A base64-encoded string representing the image.
+        bytes: The JPEG-encoded image.
 
     """
     in_mem_file = io.BytesIO()
-    image.save(in_mem_file, format="JPEG", subsampling=0, quality=100)
-    image_str = base64.b64encode(in_mem_file.getvalue()).decode()
-    base64_src = f"data:image/jpeg;base64, {image_str}"
-    return base64_src
+    # optimize and progressive are disabled on purpose, both make the encoding slower.
+    image.save(
+        in_mem_file,
+        format="JPEG",
+        quality=quality,
+        subsampling=subsampling,
+        optimize=False,
+        progressive=False,
+    )
+    return in_mem_file.getvalue()
+
+
+def bytes_to_url(data: bytes) -> str:
+    """
+    Get a URL from which the browser can load a JPEG-encoded image.
+
+    The image is registered in the Streamlit media file manager, so the browser fetches the raw bytes instead
+    of a base64 string inlined in the HTML. When there is no Streamlit runtime (e.g. bare script execution),
+    a base64 data URL is returned instead.
+
+    Args:
+        data (bytes): The JPEG-encoded image.
+
+    Returns:
+        str: The URL of the image.
+
+    """
+    if not runtime.exists():
+        # Concatenate as bytes and decode once, to avoid an extra copy of the (potentially large) string.
+        return (b"data:image/jpeg;base64," + base64.b64encode(data)).decode("ascii")
+
+    # Coordinates identify the file within the session, so they must be unique per image.
+    coordinates = f"image_zoom.{hashlib.md5(data).hexdigest()}"
+    url = runtime.get_instance().media_file_mgr.add(data, "image/jpeg", coordinates)
+    # Relative URL, so it is resolved against the app URL (base path included) from within the iframe.
+    return url.lstrip("/")
 
 
-def prepare_image(image, size, keep_aspect_ratio):
+def image_digest(image: Union[Image.Image, np.ndarray]) -> str:
     """
-    Resize the image and convert it to a base64 string.
+    Get a digest of the image content, used as the key of the prepare_image cache.
+
+    The digest is computed once per image object, so reruns passing the same object (e.g. from st.session_state)
+    do not hash the pixels again. Modifying the pixels of an image in place is therefore not detected.
+
+    Args:
+        image (Union[Image.Image, np.ndarray]): The image to be hashed. It can be a PIL Image or a NumPy array.
+
+    Returns:
+        str: The hex digest of the image pixels, size and mode (or shape and dtype).
+
+    """
+    key = id(image)
+    digest = _image_digests.get(key)
+    if digest is None:
+        if isinstance(image, np.ndarray):
+            header, data = f"{image.shape}{image.dtype}", np.ascontiguousarray(image)
+        else:
+            header, data = f"{image.size}{image.mode}", image.tobytes()
+        md5 = hashlib.md5(header.encode())
+        md5.update(data)
+        digest = md5.hexdigest()
+        _image_digests[key] = digest
+        weakref.finalize(image, _image_digests.pop, key, None)
+    return digest
+
+
+def prepare_image(image, size, keep_aspect_ratio, quality=85, subsampling=2, image_key=None):
+    """
+    Resize the image and encode it as JPEG.
+
+    The result is cached on the image digest, so reruns that only change the zoom parameters skip the resize and
+    the encoding.
 
     Args:
         image: The image to be resized.
@@ -64,32 +451,37 @@ def prepare_image(image, size, keep_aspect_ratio):
         keep_aspect_ratio: Whether to maintain the aspect ratio of the image during resizing.
             If True, the image will be resized while preserving its aspect ratio.
             If False, the image will be resized to exactly match the provided size without preserving aspect ratio.
+        quality: The JPEG quality used to encode the image.
+        subsampling: The JPEG chroma subsampling used to encode the image.
+        image_key: The cache key of the image. Defaults to image_digest(image).
 
     Returns:
-        Tuple[str, Tuple[int, int]]: A tuple containing the base64 string representation of the resized image
-            and the new size of the image.
+        Tuple[bytes, Tuple[int, int]]: A tuple containing the JPEG-encoded resized image and the new size of the image.
 
     """
+    if image_key is None:
+        image_key = image_digest(image)
+    return _prepare_image(image_key, image, size, keep_aspect_ratio, quality, subsampling)
 
+
+# The image itself is not hashed by Streamlit (leading underscore), image_key identifies it instead.
+@st.cache_data(show_spinner=False, max_entries=32)
+def _prepare_image(image_key, _image, size, keep_aspect_ratio, quality, subsampling):
+    image = _image
     # new_size=(width, height)
     if isinstance(size, int) and keep_aspect_ratio:
-        if keep_aspect_ratio:
-            width, height = image.size
-            # Calculate the aspect ratio. Width / Height
-            aspect_ratio = width / height
-            if aspect_ratio > 1:  # Fixed Width
-                new_size = (size, int(size / aspect_ratio))
-            elif aspect_ratio < 1:  # Fixed Height
-                new_size = (int(size * aspect_ratio), size)
-            else:
-                new_size = (size, size)
-        else:
-            new_size = (size, size)
+        # Scale the longest side to size.
+        width, height = image.size
+        scale = size / max(width, height)
+        new_size = (max(1, round(width * scale)), max(1, round(height * scale)))
+    elif isinstance(size, int):
+        new_size = (size, size)
     else:
-        new_size = size
+        # Integer size, so the resize does not get promoted out of the uint8 path.
+        new_size = (int(size[0]), int(size[1]))
 
-    # Convert images to base64 strings.
-    return pillow_to_base64(image.resize(new_size)), new_size
+    # Encode images as JPEG.
+    return pillow_to_bytes(resize_image(image, new_size), quality, subsampling), new_size
 
 
 def image_zoom(
@@ -100,6 +492,7 @@ def image_zoom(
     keep_resolution: Optional[bool] = False,
     zoom_factor: Optional[Union[float, int]] = 2.0,
     increment: Optional[float] = 0.2,
+    high_quality: Optional[bool] = False,
 ) -> components.html:
     """
     Display an image with interactive zoom functionality.
@@ -125,6 +518,9 @@ def image_zoom(
             Default is 2.0.
         increment (Optional[float]): The increment value for adjusting the zoom level when scrolling.
             Should be between 0 and 1. Default is 0.2.
+        high_quality (Optional[bool]): Whether to encode the image at maximum JPEG quality (quality 100, no chroma
+            subsampling). If False, a lighter encoding is used, which is faster and produces a much smaller page.
+            Default is False.
 
     Returns:
         HTML: An HTML component displaying the image with interactive zoom functionality.
@@ -141,183 +537,49 @@ def image_zoom(
     assert (
         mode in ["default", "mousemove", "scroll", "both"]
     ), "Only valid event mode are default, mousemove, scroll and both. Default work with mousemove."
+    mode = "mousemove" if mode == "default" else mode
     zoom_factor = float(zoom_factor) if isinstance(zoom_factor, int) else zoom_factor
-    assert increment <= 1.0 or increment > 0.0, "Increment should be between 0 and 1."
+    assert 0.0 < increment <= 1.0, "Increment should be between 0 and 1."
+
+    quality, subsampling = (100, 0) if high_quality else (85, 2)
 
     # Check and convert to PIL image.
-    image = check_image(image)
-    # Resize image and convert to base64.
+    image_pil = check_image(image)
+    # Digest the input object, since NumPy arrays are converted to a new PIL image on every call.
+    image_key = image_digest(image)
+    image = image_pil
+    # Resize image and encode it.
     if keep_resolution:
-        img_orig_base64, orig_size = prepare_image(image, image.size, keep_aspect_ratio)
-        img_resized_base64, resized_size = prepare_image(image, size, keep_aspect_ratio)
+        img_orig_bytes, orig_size = prepare_image(
+            image, image.size, keep_aspect_ratio, quality, subsampling, image_key
+        )
+        img_resized_bytes, resized_size = prepare_image(image, size, keep_aspect_ratio, quality, subsampling, image_key)
         params_keep_res = f"""
-                                data-original-src="{img_orig_base64}" 
+                                data-original-src="{bytes_to_url(img_orig_bytes)}" 
                                 data-original-width="{orig_size[0]}" 
                                 data-original-height="{orig_size[1]}"
                         """
     else:
-        img_resized_base64, resized_size = prepare_image(image, size, keep_aspect_ratio)
+        img_resized_bytes, resized_size = prepare_image(image, size, keep_aspect_ratio, quality, subsampling, image_key)
         params_keep_res = ""
-
-    css_code = """
-        <style>
-            #container {
-                position: relative;
-                overflow: hidden;
-                cursor: zoom-in;
-            }
-            #image {
-                position: absolute;
-                top: 0;
-                left: 0;
-                width: 100%;
-                height: 100%;
-            }
-        </style>
-    """
-    js_code = """
-        <script>
-            function calculateTransformOrigin(offsetX, offsetY, image, boundingRect, keep_resolution) {
-                let originX, originY;
-                if (keep_resolution) {
-                    const original_width = parseInt(image.getAttribute('data-original-width'));
-                    const original_height = parseInt(image.getAttribute('data-original-height'));
-                    const originX_original = (offsetX / boundingRect.width) * original_width;
-                    const originY_original = (offsetY / boundingRect.height) * original_height;
-                    originX = (originX_original / original_width) * 100 + '%';
-                    originY = (originY_original / original_height) * 100 + '%';
-                } else {
-                    originX = (offsetX / boundingRect.width) * 100 + '%';
-                    originY = (offsetY / boundingRect.height) * 100 + '%';
-                }
-                return { originX, originY };
-            }
-
-            function ImageZoomMouseMove(selector, scale_factor, keep_resolution) {
-                const image = document.getElementById(selector);
-                image.addEventListener('mousemove', function(event) {
-                    const boundingRect = image.getBoundingClientRect();
-                    const offsetX = (event.clientX - boundingRect.left);
-                    const offsetY = (event.clientY - boundingRect.top);
-                    const { originX, originY } = calculateTransformOrigin(offsetX, offsetY, image, boundingRect, keep_resolution);
-                    if (keep_resolution) {
-                        image.src = image.getAttribute('data-original-src');
-                    }
-                    image.style.transformOrigin = `${originX} ${originY}`;
-                    image.style.transform = `scale(${scale_factor})`;
-                });
-                
-                image.addEventListener('mouseout', function(event) {
-                    if (keep_resolution) {
-                        image.src = image.getAttribute('src');
-                    }
-                    image.style.transformOrigin = 'center center';
-                    image.style.transform = 'scale(1)';
-                });
-            };
-
-            function ImageZoomScroll(selector, scale_factor, increment, keep_resolution) {
-                const image = document.getElementById(selector);
-                let scale = 1
-
-                image.addEventListener('wheel', function(event) {
-                    event.preventDefault();
-                    // Get the delta of the scroll event
-                    var delta = event.deltaY || -event.detail;
-                    if (delta === undefined) {
-                        //we are on firefox
-                        delta = event.originalEvent.detail;
-                    }
-                    const sign = Math.sign(delta);
-                    scale += sign > 0 ? -increment : increment;
-                    scale = Math.max(1, Math.min(scale_factor, scale));
-
-                    const boundingRect = image.getBoundingClientRect();
-                    const offsetX = event.clientX - boundingRect.left;
-                    const offsetY = event.clientY - boundingRect.top;
-                    const { originX, originY } = calculateTransformOrigin(offsetX, offsetY, image, boundingRect, keep_resolution);
-                    if (keep_resolution) {
-                        image.src = image.getAttribute('data-original-src');
-                    }
-                    image.style.transformOrigin = `${originX} ${originY}`;
-                    image.style.transform = `scale(${scale})`;
-                });
-
-                image.addEventListener('mouseout', function(event) {
-                    if (keep_resolution) {
-                        image.src = image.getAttribute('src');
-                    }
-                    image.style.transformOrigin = 'center center';
-                    image.style.transform = 'scale(1)';
-                    scale = 1
-                });
-            };
-
-            function ImageZoomBoth(selector, scale_factor, increment, keep_resolution) {
-                const image = document.getElementById(selector);
-                let scale = 1;
-
-                image.addEventListener('mousemove', function(event) {
-                    const boundingRect = image.getBoundingClientRect();
-                    const offsetX = event.clientX - boundingRect.left;
-                    const offsetY = event.clientY - boundingRect.top;
-                    const { originX, originY } = calculateTransformOrigin(offsetX, offsetY, image, boundingRect, keep_resolution);
-                    image.style.transformOrigin = `${originX} ${originY}`;
-                    image.style.transform = `scale(${scale})`;
-                });
-
-                image.addEventListener('wheel', function(event) {
-                    event.preventDefault();
-                    // Get the delta of the scroll event
-                    var delta = event.deltaY || -event.detail;
-                    if (delta === undefined) {
-                        //we are on firefox
-                        delta = event.originalEvent.detail;
-                    }
-                    const sign = Math.sign(delta);
-                    scale += sign > 0 ? -increment : increment;
-                    scale = Math.max(1, Math.min(scale_factor, scale));
-
-                    const boundingRect = image.getBoundingClientRect();
-                    const offsetX = event.clientX - boundingRect.left;
-                    const offsetY = event.clientY - boundingRect.top;
-                    const { originX, originY } = calculateTransformOrigin(offsetX, offsetY, boundingRect, keep_resolution);
-                    if (keep_resolution) {
-                        image.src = image.getAttribute('data-original-src');
-                    }
-                    image.style.transformOrigin = `${originX} ${originY}`;
-                    image.style.transform = `scale(${scale})`;
-                });
-
-                image.addEventListener('mouseout', function(event) {
-                    if (keep_resolution) {
-                        image.src = image.getAttribute('src');
-                    }
-                    image.style.transformOrigin = 'center center';
-                    image.style.transform = 'scale(1)';
-                    scale = 1;
-                });
-            };
-        </script>
-    """
+    img_resized_src = bytes_to_url(img_resized_bytes)
 
     # Assemble the HTML code with CSS and JS.
-    html_code = f"""
-        {css_code}
-        <div id="container" style="width: {resized_size[0]}px; height: {resized_size[1]}px;">
-            <img id="image" src="{img_resized_base64}" {params_keep_res}>
-        </div>
-        {js_code}
-        <script>
-        var mode = "{mode}";
-        if (mode == "mousemove" || mode == "default") {{
-            ImageZoomMouseMove('image', {zoom_factor}, {str(keep_resolution).lower()});
-        }} else if (mode == "scroll") {{
-            ImageZoomScroll('image', {zoom_factor}, {increment},  {str(keep_resolution).lower()});
-        }} else if (mode == "both") {{
-            ImageZoomBoth('image', {zoom_factor}, {increment}, {str(keep_resolution).lower()});
-        }}
-        </script>
-    """
+    js_args = {
+        "zoom_factor": zoom_factor,
+        "increment": increment,
+        "keep_resolution": str(keep_resolution).lower(),
+    }
+    html_code = _HTML_TEMPLATE.format_map(
+        {
+            "css": _CSS_CODE,
+            "js": _JS_CODE + _JS_FUNCS[mode],
+            "js_call": _JS_CALLS[mode].format_map(js_args),
+            "width": resized_size[0],
+            "height": resized_size[1],
+            "src": img_resized_src,
+            "params_keep_res": params_keep_res,
+        }
+    )
 
     return components.html(html_code, width=resized_size[0], height=resized_size[1])
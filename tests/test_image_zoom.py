@@ -0,0 +1,110 @@
+import os
+
+import numpy as np
+import pytest
+from PIL import Image
+
+import streamlit_image_zoom
+
+from streamlit_image_zoom import check_image, image_digest, image_zoom, prepare_image, resize_image
+
+IMAGE_PATH = os.path.join(os.path.dirname(__file__), "..", "images", "building.jpg")
+
+
+def test_check_image_rgb_not_converted():
+    image = Image.open(IMAGE_PATH)
+    assert image.mode == "RGB"
+    assert check_image(image) is image
+
+    image_pil = check_image(image.convert("L"))
+    assert image_pil.mode == "RGB"
+
+
+def test_check_image_numpy():
+    array = np.zeros((4, 6, 3), dtype=np.uint8)
+    image_pil = check_image(array)
+    assert type(image_pil) is Image.Image
+    assert image_pil.size == (6, 4)
+
+
+def test_prepare_image_opened_jpeg():
+    image = check_image(Image.open(IMAGE_PATH))
+    data, new_size = prepare_image(image, 256, True)
+    assert data[:2] == b"\xff\xd8"
+    assert max(new_size) == 256
+
+
+def test_prepare_image_accepts_image_subclass():
+    data, new_size = prepare_image(Image.open(IMAGE_PATH), 256, True)
+    assert data[:2] == b"\xff\xd8"
+    assert max(new_size) == 256
+
+
+def test_image_digest():
+    image = Image.new("RGB", (6, 4))
+    assert image_digest(image) == image_digest(image)
+    assert image_digest(image) == image_digest(image.copy())
+    assert image_digest(image) != image_digest(Image.new("RGB", (6, 4), "white"))
+
+    array = np.zeros((4, 6, 3), dtype=np.uint8)
+    assert image_digest(array) == image_digest(array[:, ::-1].copy())
+    assert image_digest(array[:, ::2]) == image_digest(np.zeros((4, 3, 3), dtype=np.uint8))
+    assert image_digest(array) != image_digest(np.zeros((6, 4, 3), dtype=np.uint8))
+
+
+@pytest.fixture
+def rendered_html(monkeypatch):
+    calls = []
+    monkeypatch.setattr(
+        streamlit_image_zoom.components, "html", lambda html, width, height: calls.append((html, width, height))
+    )
+    return calls
+
+
+def test_image_zoom_opened_jpeg(rendered_html):
+    image_zoom(Image.open(IMAGE_PATH), size=256)
+    (html, width, height), = rendered_html
+    assert max(width, height) == 256
+    assert f'style="width: {width}px; height: {height}px;"' in html
+    assert 'src="data:image/jpeg;base64,' in html
+
+
+@pytest.mark.parametrize(
+    "mode, function",
+    [
+        ("default", "ImageZoomMouseMove"),
+        ("mousemove", "ImageZoomMouseMove"),
+        ("scroll", "ImageZoomScroll"),
+        ("both", "ImageZoomBoth"),
+    ],
+)
+def test_image_zoom_only_selected_mode(rendered_html, mode, function):
+    image_zoom(Image.new("RGB", (6, 4)), mode=mode, zoom_factor=3, increment=0.5)
+    (html, _, _), = rendered_html
+    functions = {"ImageZoomMouseMove", "ImageZoomScroll", "ImageZoomBoth"}
+    for other in functions - {function}:
+        assert other not in html
+    assert f"function {function}(" in html
+    assert f"{function}('image', 3.0, " in html
+
+
+@pytest.mark.parametrize("increment", [0.0, -1, 1.5])
+def test_image_zoom_invalid_increment(rendered_html, increment):
+    with pytest.raises(AssertionError):
+        image_zoom(Image.new("RGB", (6, 4)), mode="scroll", increment=increment)
+    assert not rendered_html
+
+
+def test_image_zoom_max_increment(rendered_html):
+    image_zoom(Image.new("RGB", (6, 4)), mode="scroll", increment=1.0)
+    (html, _, _), = rendered_html
+    assert "ImageZoomScroll('image', 2.0, 1.0, false);" in html
+
+
+def test_resize_image():
+    image = Image.new("RGB", (600, 400))
+    for new_size in [(100, 67), (450, 300), (1200, 800), (300, 300)]:
+        resized = resize_image(image, new_size)
+        assert resized.size == new_size
+        assert resized.mode == "RGB"
+    assert resize_image(image, (600, 400)) is image